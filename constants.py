@@ -0,0 +1,54 @@
+"""
+Shared Constants
+Loads the operation types, drone platforms and drone counts from data/constants.json
+"""
+
+import functools
+import os
+
+try:
+    # Optional faster JSON parser, falls back to the standard library
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+@functools.lru_cache(maxsize=1)
+def load_constants():
+    """
+    Load constants from JSON file.
+    
+    The file is parsed once per process and the result is shared by all callers.
+    
+    Returns:
+        Tuple of (operation types, drone platforms, number of drones) choice tuples
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    constants_file = os.path.join(script_dir, 'data/constants.json')
+    
+    if os.path.exists(constants_file):
+        with open(constants_file, 'rb') as f:
+            constants_data = json_loads(f.read())
+            return (
+                tuple(tuple(x) for x in constants_data['operation_types']),
+                tuple(tuple(x) for x in constants_data['drone_platforms']),
+                tuple(tuple(x) for x in constants_data['number_of_drones'])
+            )
+    else:
+        # Fallback to defaults if file doesn't exist
+        return (
+            (('VLOS', 'VLOS'),
+             ('BVLOS_NO_VO', 'BVLOS 1km (No Observer)'),
+             ('BVLOS_VO', 'BVLOS 2km (Observer)'),
+             ('NIGHT_VLOS', 'Night VLOS'),
+             ('NIGHT_BVLOS', 'Night BVLOS')),
+            (('DJI', 'DJI'),
+             ('EBEE', 'Ebee X'),
+             ('UOB_GLIDER', 'UoB Glider'),
+             ('SMURF', 'Papa Smurf'),
+             ('CODRONE', 'CoDrone'),
+             ('PARROT', 'Parrot Anafi')),
+            (('SINGLE', 'Single Drone'),
+             ('MULTIPLE', 'Multiple Drones'),
+             ('SWARM', 'Swarm of Drones'))
+        )
@@ -10,55 +10,103 @@ Example:
     python generate_checklist.py --operation VLOS --drone DJI --count SINGLE
 """
 
-import json
+import functools
+import math
 import os
 import sys
 import shutil
 from fpdf import FPDF
 from datetime import datetime
 import argparse
+from constants import json_loads, load_constants
 
+# Minimum number of procedures in a section before numpy is used
+NUMPY_MIN_PROCEDURES = 64
 
-def load_constants():
-    """Load constants from JSON file."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    constants_file = os.path.join(script_dir, 'data/constants.json')
+
+@functools.lru_cache(maxsize=1)
+def _numpy():
+    """
+    Import numpy on first use, or return None if it is not installed.
     
-    if os.path.exists(constants_file):
-        with open(constants_file, 'r', encoding='utf-8') as f:
-            constants_data = json.load(f)
-            return (
-                [tuple(x) for x in constants_data['operation_types']],
-                [tuple(x) for x in constants_data['drone_platforms']],
-                [tuple(x) for x in constants_data['number_of_drones']]
-            )
-    else:
-        # Fallback to defaults if file doesn't exist
-        return (
-            [('VLOS', 'VLOS'),
-             ('BVLOS_NO_VO', 'BVLOS 1km (No Observer)'),
-             ('BVLOS_VO', 'BVLOS 2km (Observer)'),
-             ('NIGHT_VLOS', 'Night VLOS'),
-             ('NIGHT_BVLOS', 'Night BVLOS')],
-            [('DJI', 'DJI'),
-             ('EBEE', 'Ebee X'),
-             ('UOB_GLIDER', 'UoB Glider'),
-             ('SMURF', 'Papa Smurf'),
-             ('CODRONE', 'CoDrone'),
-             ('PARROT', 'Parrot Anafi')],
-            [('SINGLE', 'Single Drone'),
-             ('MULTIPLE', 'Multiple Drones'),
-             ('SWARM', 'Swarm of Drones')]
-        )
+    numpy is optional and only used to vectorize the height calculations of very
+    large sections, so it is not imported unless such a section is measured.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
 
 
 # Load constants
 OPERATION_TYPE_CHOICES, DRONE_PLATFORM_CHOICES, NUMBER_OF_DRONES_CHOICES = load_constants()
 
+# Code -> display name lookups
+_OP_MAP = dict(OPERATION_TYPE_CHOICES)
+_DRONE_MAP = dict(DRONE_PLATFORM_CHOICES)
+_COUNT_MAP = dict(NUMBER_OF_DRONES_CHOICES)
+
+# Filter tag -> bit lookups, 'ALL' takes the lowest bit of every category
+_OP_BITS = {'ALL': 1, **{code: 1 << i for i, (code, _) in enumerate(OPERATION_TYPE_CHOICES, 1)}}
+_DRONE_BITS = {'ALL': 1, **{code: 1 << i for i, (code, _) in enumerate(DRONE_PLATFORM_CHOICES, 1)}}
+_COUNT_BITS = {'ALL': 1, **{code: 1 << i for i, (code, _) in enumerate(NUMBER_OF_DRONES_CHOICES, 1)}}
+
+
+def _bits(tags, tag_bits):
+    """Combine a list of filter tags into a bitmask."""
+    mask = 0
+    for tag in tags:
+        mask |= tag_bits.get(tag, 0)
+    return mask
+
+
+## STYLING
+# Compact A5 checklist
+CHECKLIST_STYLE = {
+    'name': 'Checklist',
+    'measured_text': lambda procedure: procedure['checklist_entry'],
+    'page_format': 'A5',
+    'font_size': 10,
+    'section_font_size': 12,
+    'bullet_spacing': 5,
+    'box_width': 120,
+    'vertical_spacing': 5,
+    'banner_spacing': 7.5,
+    'max_title_width': 75,
+    'right_margin': None,
+    'color_band': (140, 0, 10, 210),
+}
+
+# Detailed A4 procedure manual
+PROCEDURE_STYLE = {
+    'name': 'Procedure',
+    'measured_text': lambda procedure: f"{procedure['checklist_entry']}: {procedure['procedure_description']}",
+    'page_format': 'A4',
+    'font_size': 12,
+    'section_font_size': 14,
+    'single_par_spacing': 8,
+    'box_width': 180,
+    'vertical_spacing': 10,
+    'banner_spacing': 10,
+    'max_title_width': 125,
+    'right_margin': 20,
+    'color_band': (200, 0, 10, 297),
+}
+
 
 class ChecklistGenerator:
     """Generator for creating customized drone operation checklists and procedure manuals."""
 
+    __slots__ = (
+        'checklist_files', 'operation_type', 'drone_platform', 'number_of_drones', 'checklists',
+        'font_path_open_sans_regular', 'font_path_open_sans_bold',
+        'font_path_montserrat_bold', 'font_path_montserrat_medium',
+        'logo_path', 'output_dir', 'archive_dir',
+        '_op_bit', '_drone_bit', '_count_bit', '_filtered_cache', '_metrics_cache', '_metadata_text_prefix',
+        '_fonts', '_has_logo',
+    )
+
     def __init__(self, checklist_files, operation_type, drone_platform, number_of_drones):
         """
         Initialize the checklist generator.
@@ -73,7 +121,18 @@ class ChecklistGenerator:
         self.operation_type = operation_type
         self.drone_platform = drone_platform
         self.number_of_drones = number_of_drones
+        # A procedure matches if it is tagged with the selected option or 'ALL'
+        self._op_bit = _OP_BITS.get(operation_type, 0) | _OP_BITS['ALL']
+        self._drone_bit = _DRONE_BITS.get(drone_platform, 0) | _DRONE_BITS['ALL']
+        self._count_bit = _COUNT_BITS.get(number_of_drones, 0) | _COUNT_BITS['ALL']
         self.checklists = self.load_checklists()
+        self._filtered_cache = {}
+        self._metrics_cache = {}
+        self._metadata_text_prefix = (
+            f"{_OP_MAP.get(operation_type, operation_type)} | "
+            f"{_DRONE_MAP.get(drone_platform, drone_platform)} | "
+            f"{_COUNT_MAP.get(number_of_drones, number_of_drones)} | "
+        )
         
         # Set up paths for resources (fonts and logo)
         script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -82,6 +141,13 @@ class ChecklistGenerator:
         self.font_path_montserrat_bold = os.path.join(script_dir, 'fonts/Montserrat/static/Montserrat-Bold.ttf')
         self.font_path_montserrat_medium = os.path.join(script_dir, 'fonts/Montserrat/static/Montserrat-Medium.ttf')
         self.logo_path = os.path.join(script_dir, 'media/WD_logo.png')
+        self._has_logo = os.path.exists(self.logo_path)
+        self._fonts = (
+            ("OpenSans", "", self.font_path_open_sans_regular),
+            ("OpenSans", "B", self.font_path_open_sans_bold),
+            ("Montserrat-Bold", "", self.font_path_montserrat_bold),
+            ("Montserrat-Medium", "", self.font_path_montserrat_medium),
+        )
         
         # Create output directory if it doesn't exist
         self.output_dir = os.path.join(script_dir, 'output')
@@ -94,25 +160,42 @@ class ChecklistGenerator:
         if not os.path.exists(self.output_dir):
             return
             
-        # Get all items in output directory
-        items = os.listdir(self.output_dir)
+        # Get all items in output directory, and the names already archived,
+        # with one directory read each instead of a stat per item
+        with os.scandir(self.output_dir) as it:
+            entries = list(it)
+        with os.scandir(self.archive_dir) as it:
+            archived = {entry.name for entry in it}
         
-        for item in items:
-            item_path = os.path.join(self.output_dir, item)
+        for entry in entries:
+            item = entry.name
             # Skip the archive directory itself
             if item == 'archive':
                 continue
             # Move folders and PDF files to archive
-            if os.path.isdir(item_path) or item.endswith('.pdf'):
-                archive_path = os.path.join(self.archive_dir, item)
+            if entry.is_dir() or item.endswith('.pdf'):
+                archive_name = item
                 # If item already exists in archive, add timestamp
-                if os.path.exists(archive_path):
+                if archive_name in archived:
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    base_name = item
-                    archive_path = os.path.join(self.archive_dir, f"{base_name}_{timestamp}")
-                shutil.move(item_path, archive_path)
+                    archive_name = f"{item}_{timestamp}"
+                archive_path = os.path.join(self.archive_dir, archive_name)
+                # The archive lives inside the output directory, so a plain rename
+                # normally suffices; shutil.move remains as a fallback
+                try:
+                    os.rename(entry.path, archive_path)
+                except OSError:
+                    shutil.move(entry.path, archive_path)
+                archived.add(archive_name)
                 print(f"  Archived: {item} → archive/")
     
+    def _init_pdf(self, page_format):
+        """Create a PDF of the given page format with the generator's fonts registered."""
+        pdf = FPDF(format=page_format)
+        for family, style, path in self._fonts:
+            pdf.add_font(family, style, path)
+        return pdf
+
     def create_output_folder(self, timestamp):
         """Create a folder for the current PDF generation."""
         folder_name = f"{self.operation_type}_{self.drone_platform}_{self.number_of_drones}_{timestamp}"
@@ -127,8 +210,15 @@ class ChecklistGenerator:
             if not os.path.exists(file):
                 print(f"Warning: File not found: {file}")
                 continue
-            with open(file, 'r', encoding='utf-8') as f:
-                checklists.append(json.load(f))
+            with open(file, 'rb') as f:
+                checklist = json_loads(f.read())
+            # Precompute filter tag bitmasks so filtering is integer arithmetic
+            for section in checklist.get('items', []):
+                for procedure in section['procedures']:
+                    procedure['_op_mask'] = _bits(procedure['operation_types'], _OP_BITS)
+                    procedure['_drone_mask'] = _bits(procedure['drone_platforms'], _DRONE_BITS)
+                    procedure['_count_mask'] = _bits(procedure['number_of_drones'], _COUNT_BITS)
+            checklists.append(checklist)
         return checklists
 
     def filter_procedures(self, procedures):
@@ -141,130 +231,258 @@ class ChecklistGenerator:
         Returns:
             List of filtered procedures matching the specified criteria
         """
-        filtered_procedures = []
-        for procedure in procedures:
-            if (self.operation_type in procedure['operation_types'] or 'ALL' in procedure['operation_types']) and \
-               (self.drone_platform in procedure['drone_platforms'] or 'ALL' in procedure['drone_platforms']) and \
-               (self.number_of_drones in procedure['number_of_drones'] or 'ALL' in procedure['number_of_drones']):
-                filtered_procedures.append(procedure)
-        return filtered_procedures
+        op_bit = self._op_bit
+        drone_bit = self._drone_bit
+        count_bit = self._count_bit
+        return [
+            procedure for procedure in procedures
+            if (procedure['_op_mask'] & op_bit) and
+               (procedure['_drone_mask'] & drone_bit) and
+               (procedure['_count_mask'] & count_bit)
+        ]
+
+    def _get_filtered(self, section):
+        """Return the filtered procedures of a section, filtering each section only once."""
+        key = id(section)
+        if key not in self._filtered_cache:
+            self._filtered_cache[key] = self.filter_procedures(section['procedures'])
+        return self._filtered_cache[key]
+
+    def _get_metrics(self, pdf, section, style):
+        """
+        Return (procedure, text_width) pairs for the filtered procedures of a section.
+        
+        The style's measured text is measured with the current font once per section
+        and document style, so the height pre-pass and the render pass share it.
+        """
+        key = (id(section), style['name'])
+        if key not in self._metrics_cache:
+            measured_text = style['measured_text']
+            self._metrics_cache[key] = [
+                (procedure, pdf.get_string_width(measured_text(procedure)))
+                for procedure in self._get_filtered(section)
+            ]
+        return self._metrics_cache[key]
 
     def add_branding_banner(self, pdf, title, max_title_width, vertical_spacing):
-        """Add logo and title banner to the PDF page."""
-        if os.path.exists(self.logo_path):
+        """Add logo and title banner to the PDF page. The title is expected in upper case."""
+        if self._has_logo:
             pdf.image(self.logo_path, 10, 6, 28)
         pdf.set_font("Montserrat-Bold", size=20)
-        combined_title = f"{title}".upper()
         pdf.set_x((pdf.w - max_title_width) / 2)
-        pdf.multi_cell(max_title_width, 10, combined_title, align='C')
+        pdf.multi_cell(max_title_width, 10, title, align='C')
         pdf.ln(vertical_spacing)
 
     def add_metadata(self, pdf, font_size, box_width):
         """Add metadata box with operation details and timestamp."""
         pdf.set_font("OpenSans", size=font_size)
-        operation_type_expanded = dict(OPERATION_TYPE_CHOICES).get(self.operation_type, self.operation_type)
-        drone_platform_expanded = dict(DRONE_PLATFORM_CHOICES).get(self.drone_platform, self.drone_platform)
-        number_of_drones_expanded = dict(NUMBER_OF_DRONES_CHOICES).get(self.number_of_drones, self.number_of_drones)
-        current_datetime = datetime.now().strftime("%d-%m-%Y %H:%M")
-        metadata = f"{operation_type_expanded} | {drone_platform_expanded} | {number_of_drones_expanded} | {current_datetime}"
+        metadata = self._metadata_text_prefix + datetime.now().strftime("%d-%m-%Y %H:%M")
         pdf.set_fill_color(211, 211, 211) 
         pdf.cell(box_width, font_size*0.6, metadata, border=1, ln=True, align='C', fill=True)
 
-    def generate_checklist_pdf(self, output_folder, filename):
+    def _init_document_pdf(self, style):
+        """Create the PDF for a document style with its margins and base font set."""
+        pdf = self._init_pdf(style['page_format'])
+        if style['right_margin'] is not None:
+            pdf.set_right_margin(style['right_margin'])
+        pdf.set_font("OpenSans", size=style['font_size'])
+        return pdf
+
+    def add_page_header(self, pdf, style, title, color):
+        """Add branding banner, metadata box and color band to the current page."""
+        self.add_branding_banner(pdf, title, style['max_title_width'], style['banner_spacing'])
+        self.add_metadata(pdf, style['font_size']-3, style['box_width'])
+        pdf.set_fill_color(*color)
+        pdf.rect(*style['color_band'], 'F')  # Color band on the right of the page
+        pdf.set_text_color(0, 0, 0)
+        pdf.set_font("OpenSans", size=style['font_size'])
+
+    def _start_section(self, pdf, style, title, color, page_number, section, section_height):
         """
-        Generate a compact A5 checklist PDF.
+        Draw the box and header of a section, starting a new page if it does not fit.
+        
+        Returns:
+            The page number of the checklist after the section header is drawn
+        """
+        vertical_spacing = style['vertical_spacing']
+        box_width = style['box_width']
+        
+        # Check if new page is needed
+        if pdf.get_y() + section_height > pdf.h - pdf.b_margin:
+            page_number += 1
+            pdf.add_page()
+            self.add_page_header(pdf, style, f"{title} ({page_number})", color)
+
+        # Draw section box
+        pdf.rect(10, pdf.get_y(), box_width, section_height, 'D')
+        pdf.set_fill_color(*color)
+        pdf.rect(10, pdf.get_y(), box_width, vertical_spacing, 'F')
+        pdf.set_font("Montserrat-Medium", size=style['section_font_size'])
+        pdf.set_text_color(255, 255, 255)
+        pdf.cell(box_width, vertical_spacing, txt=section['section'], ln=True, align='C')
+        pdf.set_text_color(0, 0, 0)
+        pdf.set_font("OpenSans", size=style['font_size'])
+        return page_number
+
+    def _measure_checklist_section(self, pdf, section):
+        """
+        Measure a section of the A5 checklist.
+        
+        Returns:
+            Tuple of (metrics, section_height, content_height), where content_height
+            is the section's contribution to the total checklist height
+        """
+        bullet_spacing = CHECKLIST_STYLE['bullet_spacing']
+        box_width = CHECKLIST_STYLE['box_width']
+        vertical_spacing = CHECKLIST_STYLE['vertical_spacing']
+        
+        metrics = self._get_metrics(pdf, section, CHECKLIST_STYLE)
+        np = _numpy() if len(metrics) > NUMPY_MIN_PROCEDURES else None
+        if np is not None:
+            widths = np.fromiter((text_width for _, text_width in metrics), dtype=np.float64, count=len(metrics))
+            lines = np.maximum(1, ((widths+bullet_spacing) // (box_width))+1)
+            content_height = vertical_spacing * float(lines.sum())
+            return metrics, vertical_spacing + content_height, content_height
+        
+        section_height = vertical_spacing
+        content_height = 0
+        for procedure, text_width in metrics:
+            lines = max(1, ((text_width+bullet_spacing) // (box_width))+1)
+            section_height += vertical_spacing * lines
+            content_height += vertical_spacing * lines
+        return metrics, section_height, content_height
+
+    def _render_checklist_section(self, pdf, title, color, page_number, section, metrics, section_height):
+        """Render a section of the A5 checklist and return the updated page number."""
+        bullet_spacing = CHECKLIST_STYLE['bullet_spacing']
+        box_width = CHECKLIST_STYLE['box_width']
+        vertical_spacing = CHECKLIST_STYLE['vertical_spacing']
+        
+        page_number = self._start_section(pdf, CHECKLIST_STYLE, title, color, page_number, section, section_height)
+        
+        # Add procedures
+        for procedure, text_width in metrics:
+            lines = max(1, text_width // (box_width - bullet_spacing))
+            pdf.cell(bullet_spacing, vertical_spacing * lines, txt='o', ln=False)
+            pdf.multi_cell(box_width - bullet_spacing, vertical_spacing, txt=procedure['checklist_entry'], ln=True)
+        return page_number
+
+    def _measure_procedure_section(self, pdf, section):
+        """
+        Measure a section of the A4 procedure manual.
+        
+        Returns:
+            Tuple of (metrics, section_height, content_height), where content_height
+            is the section's contribution to the total checklist height
+        """
+        box_width = PROCEDURE_STYLE['box_width']
+        vertical_spacing = PROCEDURE_STYLE['vertical_spacing']
+        single_par_spacing = PROCEDURE_STYLE['single_par_spacing']
+        
+        metrics = self._get_metrics(pdf, section, PROCEDURE_STYLE)
+        np = _numpy() if len(metrics) > NUMPY_MIN_PROCEDURES else None
+        if np is not None:
+            widths = np.fromiter((text_width for _, text_width in metrics), dtype=np.float64, count=len(metrics))
+            entry_heights = np.ceil(widths / (box_width-10))
+            section_height = vertical_spacing + float(((entry_heights - 1) * single_par_spacing + vertical_spacing).sum())
+            entry_heights = np.ceil(widths / (box_width-7))
+            content_height = float(((entry_heights - 1) * single_par_spacing + vertical_spacing).sum())
+            return metrics, section_height, content_height
+        
+        section_height = vertical_spacing
+        content_height = 0
+        for procedure, text_width in metrics:
+            entry_height = math.ceil(text_width / (box_width-10))
+            section_height += (entry_height - 1) * single_par_spacing + vertical_spacing
+            entry_height = math.ceil(text_width / (box_width-7))
+            content_height += (entry_height - 1) * single_par_spacing + vertical_spacing
+        return metrics, section_height, content_height
+
+    def _render_procedure_section(self, pdf, title, color, page_number, section, metrics, section_height):
+        """Render a section of the A4 procedure manual and return the updated page number."""
+        font_size = PROCEDURE_STYLE['font_size']
+        vertical_spacing = PROCEDURE_STYLE['vertical_spacing']
+        single_par_spacing = PROCEDURE_STYLE['single_par_spacing']
+        
+        page_number = self._start_section(pdf, PROCEDURE_STYLE, title, color, page_number, section, section_height)
+        
+        # Add procedures with descriptions
+        for procedure, _ in metrics:
+            entry = procedure['checklist_entry']
+            description = procedure['procedure_description']
+            pdf.set_font("OpenSans", size=font_size, style='B')
+            pdf.write(single_par_spacing, f"{entry}: ")
+            pdf.set_font("OpenSans", size=font_size)
+            pdf.write(single_par_spacing, description)
+            pdf.ln(vertical_spacing)
+        return page_number
+
+    def _generate(self, output_folder, documents):
+        """
+        Render documents in lockstep from a single traversal of the checklists.
         
         Args:
             output_folder: Path to the output folder
-            filename: Name of the output PDF file
+            documents: List of (style, measure_section, render_section, filename) tuples
+            
+        Returns:
+            List of output paths, in the order of documents
         """
-        ## STYLING
-        bullet_spacing = 5
-        font_size = 10
-        box_width = 120
-        vertical_spacing = font_size / 2
-        max_title_width = 75
-        
-        ## Initialize PDF
-        pdf = FPDF(format='A5')
-        pdf.add_font("OpenSans", "", self.font_path_open_sans_regular, uni=True)
-        pdf.add_font("OpenSans", "B", self.font_path_open_sans_bold, uni=True)
-        pdf.add_font("Montserrat-Bold", "", self.font_path_montserrat_bold, uni=True)
-        pdf.add_font("Montserrat-Medium", "", self.font_path_montserrat_medium, uni=True)
-        pdf.set_font("OpenSans", size=font_size)
+        pdfs = [self._init_document_pdf(style) for style, _, _, _ in documents]
         
         for checklist in self.checklists:
-            title = checklist['title']
+            # Banner titles are upper case, convert once per checklist rather than per page
+            title = checklist['title'].upper()
             color = checklist.get('color', [0, 0, 0])
-            items = checklist['items']
-            page_number = 1
-            pdf.add_page()
-            
-            # Calculate section height
-            section_height = vertical_spacing
-            for section in items:
-                filtered_procedures = self.filter_procedures(section['procedures'])
-                for procedure in filtered_procedures:
-                    text_width = pdf.get_string_width(procedure['checklist_entry'])
-                    lines = max(1, ((text_width+bullet_spacing) // (box_width))+1)
-                    section_height += vertical_spacing * lines
             
-            # Add header
-            if pdf.get_y() + section_height > pdf.h - pdf.b_margin:
-                self.add_branding_banner(pdf, f"{title} ({page_number})", max_title_width, vertical_spacing * 1.5)
-            else:
-                self.add_branding_banner(pdf, f"{title}", max_title_width, vertical_spacing * 1.5)
+            # Measure each section once per document
+            sections = []
+            for section in checklist['items']:
+                # Skip sections with no procedures for this configuration
+                if not self._get_filtered(section):
+                    continue
+                measured = [measure_section(pdf, section) for pdf, (_, measure_section, _, _) in zip(pdfs, documents)]
+                sections.append((section, measured))
             
-            self.add_metadata(pdf, font_size-3, box_width)
-            pdf.set_fill_color(*color)
-            pdf.rect(140, 0, 10, 210, 'F')  # Color band on the right for A5
-            pdf.set_text_color(0, 0, 0)
-            pdf.set_font("OpenSans", size=font_size)
+            # Add header, numbering the title if the checklist does not fit on one page
+            for i, (pdf, (style, _, _, _)) in enumerate(zip(pdfs, documents)):
+                total_height = style['vertical_spacing'] + sum(measured[i][2] for _, measured in sections)
+                pdf.add_page()
+                if pdf.get_y() + total_height > pdf.h - pdf.b_margin:
+                    self.add_page_header(pdf, style, f"{title} (1)", color)
+                else:
+                    self.add_page_header(pdf, style, title, color)
             
             # Process sections
-            for section in items:
-                section_height = vertical_spacing
-                filtered_procedures = self.filter_procedures(section['procedures'])
-                for procedure in filtered_procedures:
-                    text_width = pdf.get_string_width(procedure['checklist_entry'])
-                    lines = max(1, ((text_width+bullet_spacing) // (box_width))+1)
-                    section_height += vertical_spacing * lines
-
-                # Check if new page is needed
-                if pdf.get_y() + section_height > pdf.h - pdf.b_margin:
-                    page_number += 1
-                    pdf.add_page()
-                    self.add_branding_banner(pdf, f"{title} ({page_number})", max_title_width, vertical_spacing * 1.5)
-                    self.add_metadata(pdf, font_size-3, box_width)
-                    pdf.set_fill_color(*color)
-                    pdf.rect(140, 0, 10, 210, 'F')
-                    pdf.set_text_color(0, 0, 0)
-                    pdf.set_font("OpenSans", size=font_size)
-
-                # Draw section box
-                pdf.rect(10, pdf.get_y(), box_width, section_height, 'D')
-                pdf.set_fill_color(*color)
-                pdf.rect(10, pdf.get_y(), box_width, vertical_spacing, 'F')
-                pdf.set_font("Montserrat-Medium", size=font_size + 2)
-                pdf.set_text_color(255, 255, 255)
-                pdf.cell(box_width, vertical_spacing, txt=section['section'], ln=True, align='C')
-                pdf.set_text_color(0, 0, 0)
-                pdf.set_font("OpenSans", size=font_size)
-                
-                # Add procedures
-                for procedure in filtered_procedures:
-                    text_width = pdf.get_string_width(procedure['checklist_entry'])
-                    lines = max(1, text_width // (box_width - bullet_spacing))
-                    pdf.cell(bullet_spacing, vertical_spacing * lines, txt='o', ln=False)
-                    pdf.multi_cell(box_width - bullet_spacing, vertical_spacing, txt=procedure['checklist_entry'], ln=True)
+            page_numbers = [1] * len(documents)
+            for section, measured in sections:
+                for i, (pdf, (_, _, render_section, _)) in enumerate(zip(pdfs, documents)):
+                    metrics, section_height, _ = measured[i]
+                    page_numbers[i] = render_section(pdf, title, color, page_numbers[i], section, metrics, section_height)
             
-            pdf.ln(vertical_spacing)
+            for pdf, (style, _, _, _) in zip(pdfs, documents):
+                pdf.ln(style['vertical_spacing'])
+        
+        # Output PDFs
+        output_paths = []
+        for pdf, (style, _, _, filename) in zip(pdfs, documents):
+            output_path = os.path.join(output_folder, filename)
+            pdf.output(output_path)
+            print(f"✓ {style['name']} PDF generated: {filename}")
+            output_paths.append(output_path)
+        pdfs.clear()
+        return output_paths
+
+    def generate_checklist_pdf(self, output_folder, filename):
+        """
+        Generate a compact A5 checklist PDF.
         
-        # Output PDF
-        output_path = os.path.join(output_folder, filename)
-        pdf.output(output_path)
-        print(f"✓ Checklist PDF generated: {filename}")
-        return output_path
+        Args:
+            output_folder: Path to the output folder
+            filename: Name of the output PDF file
+        """
+        documents = [(CHECKLIST_STYLE, self._measure_checklist_section, self._render_checklist_section, filename)]
+        return self._generate(output_folder, documents)[0]
 
     def generate_procedure_pdf(self, output_folder, filename):
         """
@@ -274,111 +492,60 @@ class ChecklistGenerator:
             output_folder: Path to the output folder
             filename: Name of the output PDF file
         """
-        ## STYLING
-        font_size = 12
-        section_font_size = 14
-        vertical_spacing = 10
-        single_par_spacing = 8
-        right_margin = 20
-        box_width = 200 - right_margin
-        max_title_width = 125
-        
-        ## Initialize PDF
-        pdf = FPDF(format='A4')
-        pdf.set_right_margin(right_margin)
-        pdf.add_font("OpenSans", "", self.font_path_open_sans_regular, uni=True)
-        pdf.add_font("OpenSans", "B", self.font_path_open_sans_bold, uni=True)
-        pdf.add_font("Montserrat-Bold", "", self.font_path_montserrat_bold, uni=True)
-        pdf.add_font("Montserrat-Medium", "", self.font_path_montserrat_medium, uni=True)
-        pdf.set_font("OpenSans", size=font_size)
+        documents = [(PROCEDURE_STYLE, self._measure_procedure_section, self._render_procedure_section, filename)]
+        return self._generate(output_folder, documents)[0]
+
+    def generate_both(self, output_folder, checklist_filename='checklist.pdf', procedure_filename='procedures.pdf',
+                      parallel=False):
+        """
+        Generate the A5 checklist and the A4 procedure manual in a single pass.
         
-        for checklist in self.checklists:
-            title = checklist['title']
-            color = checklist.get('color', [0, 0, 0])
-            items = checklist['items']
-            page_number = 1
-            pdf.add_page()
-            
-            # Calculate section height
-            section_height = vertical_spacing
-            for section in items:
-                filtered_procedures = self.filter_procedures(section['procedures'])
-                for procedure in filtered_procedures:
-                    entry = procedure['checklist_entry']
-                    description = procedure['procedure_description']
-                    entry_height = -(-pdf.get_string_width(entry + ": " + description) // (box_width-7))
-                    section_height += (entry_height - 1) * single_par_spacing + vertical_spacing
-            
-            # Add header
-            if pdf.get_y() + section_height > pdf.h - pdf.b_margin:
-                self.add_branding_banner(pdf, f"{title} ({page_number})", max_title_width, vertical_spacing)
-            else:
-                self.add_branding_banner(pdf, f"{title}", max_title_width, vertical_spacing)
-            
-            self.add_metadata(pdf, font_size-3, box_width)
-            pdf.set_fill_color(*color)
-            pdf.rect(200, 0, 10, 297, 'F')  # Color band on the right for A4
-            pdf.set_text_color(0, 0, 0)
-            pdf.set_font("OpenSans", size=font_size)
+        With parallel, each worker process reloads and filters the checklist data
+        itself, so it only pays off when more than two CPUs are available.
+        
+        Args:
+            output_folder: Path to the output folder
+            checklist_filename: Name of the checklist PDF file
+            procedure_filename: Name of the procedure manual PDF file
+            parallel: Render each PDF in its own worker process when several CPUs are available
             
-            # Process sections
-            for section in items:
-                section_height = vertical_spacing
-                filtered_procedures = self.filter_procedures(section['procedures'])
-                for procedure in filtered_procedures:
-                    entry = procedure['checklist_entry']
-                    description = procedure['procedure_description']
-                    entry_height = -(-pdf.get_string_width(entry + ": " + description) // (box_width-10))
-                    section_height += (entry_height - 1) * single_par_spacing + vertical_spacing
-
-                # Check if new page is needed
-                if pdf.get_y() + section_height > pdf.h - pdf.b_margin:
-                    page_number += 1
-                    pdf.add_page()
-                    self.add_branding_banner(pdf, f"{title} ({page_number})", max_title_width, vertical_spacing)
-                    self.add_metadata(pdf, font_size-3, box_width)
-                    pdf.set_fill_color(*color)
-                    pdf.rect(200, 0, 10, 297, 'F')
-                    pdf.set_text_color(0, 0, 0)
-                    pdf.set_font("OpenSans", size=font_size)
-
-                # Draw section box
-                pdf.rect(10, pdf.get_y(), box_width, section_height, 'D')
-                pdf.set_fill_color(*color)
-                pdf.rect(10, pdf.get_y(), box_width, vertical_spacing, 'F')
-                pdf.set_font("Montserrat-Medium", size=section_font_size)
-                pdf.set_text_color(255, 255, 255)
-                pdf.cell(box_width, vertical_spacing, txt=section['section'], ln=True, align='C')
-                pdf.set_text_color(0, 0, 0)
-                pdf.set_font("OpenSans", size=font_size)
-                
-                # Add procedures with descriptions
-                for procedure in filtered_procedures:
-                    entry = procedure['checklist_entry']
-                    description = procedure['procedure_description']
-                    pdf.set_font("OpenSans", size=font_size, style='B')
-                    pdf.write(single_par_spacing, f"{entry}: ")
-                    pdf.set_font("OpenSans", size=font_size)
-                    pdf.write(single_par_spacing, description)
-                    pdf.ln(vertical_spacing)
+        Returns:
+            Tuple of (checklist_path, procedure_path)
+        """
+        if parallel and (os.cpu_count() or 1) >= 2:
+            from concurrent.futures import ProcessPoolExecutor
             
-            pdf.ln(vertical_spacing)
+            args = (self.checklist_files, self.operation_type, self.drone_platform, self.number_of_drones, output_folder)
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                checklist_future = executor.submit(_generate_document, *args, 'generate_checklist_pdf', checklist_filename)
+                procedure_future = executor.submit(_generate_document, *args, 'generate_procedure_pdf', procedure_filename)
+                return checklist_future.result(), procedure_future.result()
         
-        # Output PDF
-        output_path = os.path.join(output_folder, filename)
-        pdf.output(output_path)
-        print(f"✓ Procedure PDF generated: {filename}")
-        return output_path
+        documents = [
+            (CHECKLIST_STYLE, self._measure_checklist_section, self._render_checklist_section, checklist_filename),
+            (PROCEDURE_STYLE, self._measure_procedure_section, self._render_procedure_section, procedure_filename),
+        ]
+        checklist_path, procedure_path = self._generate(output_folder, documents)
+        return checklist_path, procedure_path
+
+
+def _generate_document(checklist_files, operation_type, drone_platform, number_of_drones, output_folder,
+                       method_name, filename):
+    """Generate a single PDF with a fresh generator, for use in a worker process."""
+    generator = ChecklistGenerator(checklist_files, operation_type, drone_platform, number_of_drones)
+    return getattr(generator, method_name)(output_folder, filename)
 
 
 def get_json_files(json_dir):
     """Get all JSON files from the data directory in order."""
-    json_files = []
-    if os.path.exists(json_dir):
-        for filename in sorted(os.listdir(json_dir)):
-            if filename.endswith('.json'):
-                json_files.append(os.path.join(json_dir, filename))
-    return json_files
+    if not os.path.exists(json_dir):
+        return []
+    # Filter in a single directory pass, then sort only the JSON files
+    with os.scandir(json_dir) as entries:
+        return sorted(
+            os.path.join(json_dir, entry.name) for entry in entries
+            if entry.name.endswith('.json') and entry.is_file()
+        )
 
 
 def main():
@@ -436,6 +603,10 @@ Number of Drones:
     parser.add_argument('--json-dir',
                         help='Path to JSON data directory (default: ./data/json)')
     
+    parser.add_argument('--parallel',
+                        action='store_true',
+                        help='Render the checklist and procedure PDFs in separate processes')
+    
     args = parser.parse_args()
     
     if args.list_options:
@@ -452,9 +623,23 @@ Number of Drones:
         print()
         return
     
+    run(args.operation, args.drone, args.count, json_dir=args.json_dir, parallel=args.parallel)
+
+
+def run(operation, drone, count, json_dir=None, parallel=False):
+    """
+    Generate the checklist and procedure PDFs for the given configuration.
+    
+    Args:
+        operation: Operation type code (e.g. VLOS)
+        drone: Drone platform code (e.g. DJI)
+        count: Number of drones code (e.g. SINGLE)
+        json_dir: Path to JSON data directory (default: ./data/json)
+        parallel: Render the checklist and procedure PDFs in separate processes
+    """
     # Determine JSON directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    json_dir = args.json_dir if args.json_dir else os.path.join(script_dir, 'data/json')
+    json_dir = json_dir if json_dir else os.path.join(script_dir, 'data/json')
     
     if not os.path.exists(json_dir):
         print(f"Error: JSON data directory not found: {json_dir}")
@@ -469,9 +654,9 @@ Number of Drones:
         sys.exit(1)
     
     print(f"\nGenerating checklists with:")
-    print(f"  Operation Type: {dict(OPERATION_TYPE_CHOICES)[args.operation]}")
-    print(f"  Drone Platform: {dict(DRONE_PLATFORM_CHOICES)[args.drone]}")
-    print(f"  Number of Drones: {dict(NUMBER_OF_DRONES_CHOICES)[args.count]}")
+    print(f"  Operation Type: {_OP_MAP[operation]}")
+    print(f"  Drone Platform: {_DRONE_MAP[drone]}")
+    print(f"  Number of Drones: {_COUNT_MAP[count]}")
     print(f"  JSON Files: {len(json_files)} files loaded")
     print()
     
@@ -479,9 +664,9 @@ Number of Drones:
     try:
         generator = ChecklistGenerator(
             checklist_files=json_files,
-            operation_type=args.operation,
-            drone_platform=args.drone,
-            number_of_drones=args.count
+            operation_type=operation,
+            drone_platform=drone,
+            number_of_drones=count
         )
         
         # Archive existing PDFs
@@ -502,8 +687,7 @@ Number of Drones:
         procedure_filename = f"procedures.pdf"
         
         # Generate PDFs
-        generator.generate_checklist_pdf(output_folder, checklist_filename)
-        generator.generate_procedure_pdf(output_folder, procedure_filename)
+        generator.generate_both(output_folder, checklist_filename, procedure_filename, parallel=parallel)
         
         print("\n✓ All documents generated successfully!")
         print(f"  Output folder: output/{folder_name}/")
@@ -4,23 +4,14 @@ Interactive Checklist Generator
 Prompts user for input and generates checklists
 """
 
-import subprocess
 import sys
-import json
-import os
 
-
-def load_constants():
-    """Load constants from JSON file."""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    constants_file = os.path.join(script_dir, 'data/constants.json')
-    
-    with open(constants_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+from constants import load_constants
+from generate_checklist import run
 
 
 def main():
-    constants = load_constants()
+    op_choices, drone_choices, count_choices = load_constants()
     
     print("=" * 60)
     print("  Drone Operations Checklist Generator")
@@ -29,7 +20,6 @@ def main():
     
     # Operation Types
     print("Operation Types:")
-    op_choices = constants['operation_types']
     for i, (code, name) in enumerate(op_choices, 1):
         print(f"  {i}. {code:15} - {name}")
     print()
@@ -42,7 +32,6 @@ def main():
     print()
     # Drone Platforms
     print("Drone Platforms:")
-    drone_choices = constants['drone_platforms']
     for i, (code, name) in enumerate(drone_choices, 1):
         print(f"  {i}. {code:15} - {name}")
     print()
@@ -55,7 +44,6 @@ def main():
     print()
     # Number of Drones
     print("Number of Drones:")
-    count_choices = constants['number_of_drones']
     for i, (code, name) in enumerate(count_choices, 1):
         print(f"  {i}. {code:15} - {name}")
     print()
@@ -74,9 +62,8 @@ def main():
     print("=" * 60)
     print()
     
-    # Run the generator
-    cmd = ["python", "generate_checklist.py", "-o", operation, "-d", drone, "-c", count]
-    subprocess.run(cmd)
+    # Run the generator in this process
+    run(operation, drone, count)
 
 if __name__ == "__main__":
     try: